@@ -28,20 +28,35 @@ import base64
 import ctypes
 import ctypes.wintypes
 import csv
+import functools
 import json
 import logging
 import os
+import re
 import shutil
 import sys
 import threading
 import time
 import tkinter as tk
 import winreg
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
-import pynput.keyboard as pynput_kb
+pynput_kb = None   # pynput.keyboard — heavy, loaded on first listener use
+
+
+def _load_pynput():
+    """Import pynput lazily so startup and the native-hook path never pay
+    for it; the module reference is cached at module level after the first
+    call, so later attribute lookups cost the same as an eager import."""
+    global pynput_kb
+    if pynput_kb is None:
+        import pynput.keyboard
+        pynput_kb = pynput.keyboard
+    return pynput_kb
+
 
 # ──────────────────────────────────────────────────────────────────
 # OPTIONAL IMPORTS
@@ -58,6 +73,18 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    import ahocorasick   # pyahocorasick — C-extension multi-pattern matcher
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson        # C-extension JSON, ~10× faster than stdlib
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ──────────────────────────────────────────────────────────────────
 # CONSTANTS
 # ──────────────────────────────────────────────────────────────────
@@ -87,12 +114,38 @@ WORD_BOUNDARY_CHARS = set(
 # Windows API constants
 ES_PASSWORD = 0x0020   # Edit control password style
 
+# Bound once at import — every ctypes.windll.user32.Foo lookup walks the
+# DLL wrapper's attribute cache, which adds up on the per-keystroke path.
+if sys.platform == "win32":
+    _user32   = ctypes.windll.user32
+    _kernel32 = ctypes.windll.kernel32
+    # ctypes defaults every restype to c_int, which truncates 64-bit
+    # handles and pointers — declare the bindings whose results we keep.
+    _user32.SetWindowsHookExW.restype  = ctypes.wintypes.HHOOK
+    _user32.GetClipboardData.restype   = ctypes.wintypes.HANDLE
+    _user32.SetClipboardData.restype   = ctypes.wintypes.HANDLE
+    _user32.SetClipboardData.argtypes  = (ctypes.wintypes.UINT,
+                                          ctypes.wintypes.HANDLE)
+    _kernel32.GlobalAlloc.restype      = ctypes.wintypes.HGLOBAL
+    _kernel32.GlobalAlloc.argtypes     = (ctypes.wintypes.UINT, ctypes.c_size_t)
+    _kernel32.GlobalLock.restype       = ctypes.wintypes.LPVOID
+    _kernel32.GlobalLock.argtypes      = (ctypes.wintypes.HGLOBAL,)
+    _kernel32.GlobalUnlock.argtypes    = (ctypes.wintypes.HGLOBAL,)
+    _kernel32.GlobalFree.restype       = ctypes.wintypes.HGLOBAL
+    _kernel32.GlobalFree.argtypes      = (ctypes.wintypes.HGLOBAL,)
+else:   # engine falls back to pynput off Windows
+    _user32 = _kernel32 = None
+
 BLOCKED_WINDOW_CLASSES = {
     "CredentialUIBroker",
     "Credential Dialog Xaml Host",
     "NativeHWNDHost",
 }
 
+# One-pass control-char escaping for list display — a prebuilt translate
+# table beats chained str.replace calls and is computed once.
+DISPLAY_ESCAPES = str.maketrans({"\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
 # Dynamic variable tokens
 DYN_VARS = {
     "%DATE%":     lambda: datetime.now().strftime("%d/%m/%Y"),
@@ -153,40 +206,469 @@ def decrypt_str(text: str, fernet) -> str:
 # ──────────────────────────────────────────────────────────────────
 # CLIPBOARD HELPER
 # ──────────────────────────────────────────────────────────────────
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE  = 0x0002
+
+
 def get_clipboard() -> str:
     """Read current clipboard contents on Windows."""
     try:
-        CF_UNICODETEXT = 13
-        ctypes.windll.user32.OpenClipboard(0)
-        handle = ctypes.windll.user32.GetClipboardData(CF_UNICODETEXT)
+        _user32.OpenClipboard(0)
+        handle = _user32.GetClipboardData(CF_UNICODETEXT)
         if not handle:
             return ""
-        ptr = ctypes.windll.kernel32.GlobalLock(handle)
+        ptr = _kernel32.GlobalLock(handle)
         if not ptr:
             return ""
         text = ctypes.wstring_at(ptr)
-        ctypes.windll.kernel32.GlobalUnlock(handle)
+        _kernel32.GlobalUnlock(handle)
         return text
     except Exception:
         return ""
     finally:
         try:
-            ctypes.windll.user32.CloseClipboard()
+            _user32.CloseClipboard()
         except Exception:
             pass
 
 
+def set_clipboard(text: str) -> bool:
+    """Place `text` on the clipboard as CF_UNICODETEXT."""
+    try:
+        if not _user32.OpenClipboard(0):
+            return False
+        try:
+            _user32.EmptyClipboard()
+            buf = ctypes.create_unicode_buffer(text)
+            size = ctypes.sizeof(buf)
+            handle = _kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
+            if not handle:
+                return False
+            ptr = _kernel32.GlobalLock(handle)
+            if not ptr:
+                _kernel32.GlobalFree(handle)
+                return False
+            ctypes.memmove(ptr, buf, size)
+            _kernel32.GlobalUnlock(handle)
+            if not _user32.SetClipboardData(CF_UNICODETEXT, handle):
+                # The system only takes ownership on success
+                _kernel32.GlobalFree(handle)
+                return False
+            return True
+        finally:
+            _user32.CloseClipboard()
+    except Exception:
+        return False
+
+
+# ──────────────────────────────────────────────────────────────────
+# SENDINPUT  (batched synthetic keystrokes)
+# ──────────────────────────────────────────────────────────────────
+INPUT_KEYBOARD    = 1
+KEYEVENTF_KEYUP   = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_BACK           = 0x08
+VK_V              = 0x56
+
+# Above this size, pasting beats per-character injection
+CLIPBOARD_PASTE_THRESHOLD = 2048
+
+_ULONG_PTR = ctypes.wintypes.WPARAM   # pointer-sized unsigned int
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = (
+        ("wVk",         ctypes.wintypes.WORD),
+        ("wScan",       ctypes.wintypes.WORD),
+        ("dwFlags",     ctypes.wintypes.DWORD),
+        ("time",        ctypes.wintypes.DWORD),
+        ("dwExtraInfo", _ULONG_PTR),
+    )
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = (
+        ("dx",          ctypes.wintypes.LONG),
+        ("dy",          ctypes.wintypes.LONG),
+        ("mouseData",   ctypes.wintypes.DWORD),
+        ("dwFlags",     ctypes.wintypes.DWORD),
+        ("time",        ctypes.wintypes.DWORD),
+        ("dwExtraInfo", _ULONG_PTR),
+    )
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = (
+        ("uMsg",    ctypes.wintypes.DWORD),
+        ("wParamL", ctypes.wintypes.WORD),
+        ("wParamH", ctypes.wintypes.WORD),
+    )
+
+
+class _INPUT(ctypes.Structure):
+    class _U(ctypes.Union):
+        _fields_ = (
+            ("ki", _KEYBDINPUT),
+            ("mi", _MOUSEINPUT),
+            ("hi", _HARDWAREINPUT),
+        )
+    _anonymous_ = ("u",)
+    _fields_ = (("type", ctypes.wintypes.DWORD), ("u", _U))
+
+
+class _InputPool:
+    """Reusable SendInput arrays, bucketed by power-of-two capacity.
+
+    Frequent expansions would otherwise allocate a fresh (INPUT*N)() array
+    per call. acquire() hands out the smallest bucket that fits; requests
+    beyond the largest bucket fall through to a one-off allocation that is
+    never pooled. SendInput is always called with the exact record count,
+    so stale data past the filled slots is never read — but fill code must
+    write every field it relies on, since reused records keep old values.
+    """
+
+    _CAPS = (16, 64, 256, 1024)
+    _PER_BUCKET = 4
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict[int, list] = {cap: [] for cap in self._CAPS}
+
+    def acquire(self, n: int):
+        """Return (array, capacity) with room for n INPUT records."""
+        for cap in self._CAPS:
+            if n <= cap:
+                with self._lock:
+                    pool = self._pools[cap]
+                    arr = pool.pop() if pool else (_INPUT * cap)()
+                return arr, cap
+        return (_INPUT * n)(), 0
+
+    def release(self, arr, cap: int):
+        if cap:
+            with self._lock:
+                pool = self._pools[cap]
+                if len(pool) < self._PER_BUCKET:
+                    pool.append(arr)
+
+
+_input_pool = _InputPool()
+
+
+def send_backspaces(count: int) -> bool:
+    """Delete `count` characters with a single batched SendInput call.
+
+    Injected events are serialized by the OS, so no inter-key sleeps are
+    needed — one syscall replaces 2×count keybd events with sleeps between.
+    """
+    if count <= 0:
+        return True
+    try:
+        n = count * 2
+        arr, cap = _input_pool.acquire(n)
+        try:
+            for i in range(count):
+                down = arr[2 * i]
+                down.type = INPUT_KEYBOARD
+                down.ki.wVk = VK_BACK
+                down.ki.wScan = 0
+                down.ki.dwFlags = 0
+                up = arr[2 * i + 1]
+                up.type = INPUT_KEYBOARD
+                up.ki.wVk = VK_BACK
+                up.ki.wScan = 0
+                up.ki.dwFlags = KEYEVENTF_KEYUP
+            sent = _user32.SendInput(
+                n, ctypes.byref(arr), ctypes.sizeof(_INPUT)
+            )
+        finally:
+            _input_pool.release(arr, cap)
+        return sent == n
+    except Exception:
+        return False
+
+
+def send_unicode_text(text: str) -> bool:
+    """Type `text` with a single batched SendInput call.
+
+    KEYEVENTF_UNICODE injects raw UTF-16 code units directly, so arbitrary
+    characters land in the focused window without layout mapping or
+    clipboard involvement; code points outside the BMP are emitted as
+    surrogate pairs.
+    """
+    if not text:
+        return True
+    try:
+        units: list[int] = []
+        for ch in text:
+            cp = ord(ch)
+            if cp > 0xFFFF:
+                cp -= 0x10000
+                units.append(0xD800 + (cp >> 10))
+                units.append(0xDC00 + (cp & 0x3FF))
+            else:
+                units.append(cp)
+        n = len(units) * 2
+        arr, cap = _input_pool.acquire(n)
+        try:
+            for i, unit in enumerate(units):
+                down = arr[2 * i]
+                down.type = INPUT_KEYBOARD
+                down.ki.wVk = 0
+                down.ki.wScan = unit
+                down.ki.dwFlags = KEYEVENTF_UNICODE
+                up = arr[2 * i + 1]
+                up.type = INPUT_KEYBOARD
+                up.ki.wVk = 0
+                up.ki.wScan = unit
+                up.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
+            sent = _user32.SendInput(
+                n, ctypes.byref(arr), ctypes.sizeof(_INPUT)
+            )
+        finally:
+            _input_pool.release(arr, cap)
+        return sent == n
+    except Exception:
+        return False
+
+
+def _send_ctrl_v() -> bool:
+    """Send a Ctrl+V chord as one batched SendInput call."""
+    try:
+        arr, cap = _input_pool.acquire(4)
+        try:
+            for i, (vk, flags) in enumerate((
+                (VK_CONTROL, 0),
+                (VK_V,       0),
+                (VK_V,       KEYEVENTF_KEYUP),
+                (VK_CONTROL, KEYEVENTF_KEYUP),
+            )):
+                arr[i].type = INPUT_KEYBOARD
+                arr[i].ki.wVk = vk
+                arr[i].ki.wScan = 0
+                arr[i].ki.dwFlags = flags
+            sent = _user32.SendInput(4, ctypes.byref(arr), ctypes.sizeof(_INPUT))
+        finally:
+            _input_pool.release(arr, cap)
+        return sent == 4
+    except Exception:
+        return False
+
+
+def _wait_for_paste(timeout: float = 1.0):
+    """Best-effort wait until the foreground app has consumed the Ctrl+V.
+
+    SendInput only queues the chord, so restoring the clipboard on a fixed
+    short timer races the target. A synchronous WM_NULL to the foreground
+    window returns once its thread is pumping messages again — i.e. it has
+    worked through the posted input ahead of it — and a small floor covers
+    apps that defer the actual clipboard read.
+    """
+    try:
+        hwnd = _user32.GetForegroundWindow()
+        if hwnd:
+            SMTO_ABORTIFHUNG = 0x0002
+            result = ctypes.wintypes.DWORD()
+            _user32.SendMessageTimeoutW(
+                hwnd, 0, 0, 0,   # WM_NULL
+                SMTO_ABORTIFHUNG, int(timeout * 1000), ctypes.byref(result),
+            )
+    except Exception:
+        pass
+    time.sleep(0.15)
+
+
+def paste_via_clipboard(text: str) -> bool:
+    """Paste `text` through the clipboard, restoring the old contents.
+
+    Save → set → Ctrl+V → wait → restore runs synchronously in the
+    expansion worker, so there is no helper thread and the user's
+    clipboard holds the expansion only until the target has pasted it.
+    Non-text clipboard contents (images, files) cannot be snapshotted
+    this way and are lost on restore — the reason this path is reserved
+    for large expansions.
+    """
+    saved = get_clipboard()
+    if not set_clipboard(text):
+        return False
+    ok = _send_ctrl_v()
+    if ok:
+        _wait_for_paste()
+    set_clipboard(saved)
+    return ok
+
+
+# ──────────────────────────────────────────────────────────────────
+# LOW-LEVEL KEYBOARD HOOK
+# ──────────────────────────────────────────────────────────────────
+WH_KEYBOARD_LL = 13
+WM_KEYDOWN     = 0x0100
+WM_SYSKEYDOWN  = 0x0104
+WM_QUIT        = 0x0012
+LLKHF_INJECTED = 0x10
+
+VK_CONTROL = 0x11
+VK_MENU    = 0x12   # Alt
+
+
+class _KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = (
+        ("vkCode",      ctypes.wintypes.DWORD),
+        ("scanCode",    ctypes.wintypes.DWORD),
+        ("flags",       ctypes.wintypes.DWORD),
+        ("time",        ctypes.wintypes.DWORD),
+        ("dwExtraInfo", _ULONG_PTR),
+    )
+
+
+# Reused per-call by _vk_to_char — only the hook pump thread touches them,
+# so sharing is safe and saves two ctypes allocations per keystroke.
+_VK_STATE = (ctypes.c_ubyte * 256)()
+_VK_BUF   = ctypes.create_unicode_buffer(8)
+
+
+def _vk_to_char(vk: int, scan: int) -> str | None:
+    """Map a virtual-key code to the character it would type, if any."""
+    try:
+        user32 = _user32
+        # Chords with Ctrl/Alt are shortcuts, not typed text
+        if user32.GetAsyncKeyState(VK_CONTROL) & 0x8000:
+            return None
+        if user32.GetAsyncKeyState(VK_MENU) & 0x8000:
+            return None
+        state = _VK_STATE
+        ctypes.memset(state, 0, 256)
+        # GetKeyboardState tracks the pump thread's queue, not the user's —
+        # sample the modifiers that matter for translation directly.
+        for mod in (0x10, 0xA0, 0xA1):            # VK_SHIFT, L/R
+            if user32.GetAsyncKeyState(mod) & 0x8000:
+                state[mod] = 0x80
+        if user32.GetKeyState(0x14) & 1:          # VK_CAPITAL toggle
+            state[0x14] = 0x01
+        hkl = user32.GetKeyboardLayout(
+            user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), None)
+        )
+        buf = _VK_BUF
+        n = user32.ToUnicodeEx(vk, scan, state, buf, len(buf) - 1, 0, hkl)
+        if n > 0:
+            return buf.value[:n]
+    except Exception:
+        pass
+    return None
+
+
+class _NativeKeyboardHook:
+    """Low-level keyboard hook with a dedicated message-pump thread.
+
+    SetWindowsHookEx(WH_KEYBOARD_LL) delivers key events to the callback
+    with far lower latency than pynput's listener, and exposes the
+    injected-event flag so the engine can ignore its own SendInput echoes.
+    handler(vk, char) is called for every physical key-down; char is the
+    text the key would produce, or None for non-printing keys.
+    """
+
+    def __init__(self, handler):
+        self._handler   = handler
+        self._hook      = None
+        self._hookproc  = None   # keep alive — ctypes must not GC the callback
+        self._thread_id = None
+        self._cancelled = False
+
+    def start(self) -> bool:
+        if sys.platform != "win32":
+            return False
+        started = threading.Event()
+        self._cancelled = False
+        threading.Thread(target=self._pump, args=(started,), daemon=True).start()
+        if not started.wait(timeout=2.0):
+            # Pump never reported — the caller is about to start the pynput
+            # fallback, so make sure a late install tears itself down rather
+            # than leaving two sources feeding the engine.
+            self._cancelled = True
+            return False
+        return bool(self._hook)
+
+    def stop(self):
+        if self._thread_id:
+            try:
+                _user32.PostThreadMessageW(
+                    self._thread_id, WM_QUIT, 0, 0
+                )
+            except Exception:
+                pass
+        self._thread_id = None
+
+    def _pump(self, started: threading.Event):
+        user32   = _user32
+        kernel32 = _kernel32
+
+        HOOKPROC = ctypes.WINFUNCTYPE(
+            ctypes.c_ssize_t, ctypes.c_int,
+            ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM,
+        )
+
+        def hook_proc(n_code, w_param, l_param):
+            if n_code >= 0 and w_param in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                kb = ctypes.cast(
+                    l_param, ctypes.POINTER(_KBDLLHOOKSTRUCT)
+                ).contents
+                if not kb.flags & LLKHF_INJECTED:   # skip our own SendInput echo
+                    try:
+                        self._handler(
+                            kb.vkCode, _vk_to_char(kb.vkCode, kb.scanCode)
+                        )
+                    except Exception:
+                        pass
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        try:
+            self._hookproc = HOOKPROC(hook_proc)
+            # NULL means the install was refused (e.g. secure desktop)
+            self._hook = user32.SetWindowsHookExW(
+                WH_KEYBOARD_LL, self._hookproc,
+                kernel32.GetModuleHandleW(None), 0,
+            ) or None
+            self._thread_id = kernel32.GetCurrentThreadId()
+        except Exception:
+            self._hook = None
+        started.set()
+        if not self._hook:
+            return
+        if self._cancelled:
+            # start() timed out and fell back to pynput — don't double-feed
+            user32.UnhookWindowsHookEx(self._hook)
+            self._hook = None
+            return
+        msg = ctypes.wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWindowsHookEx(self._hook)
+        self._hook = None
+
+
 # ──────────────────────────────────────────────────────────────────
 # DYNAMIC VARIABLE RESOLUTION
 # ──────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=32)
+def _dyn_cached(token: str, _second: int) -> str:
+    """Format a dynamic variable, memoized per wall-clock second.
+
+    The finest-grained token is %TIME% (minute resolution), so bursts of
+    expansions within the same second reuse one strftime result instead of
+    re-running datetime.now().strftime each time.
+    """
+    return DYN_VARS[token]()
+
+
 def resolve_variables(text: str) -> str:
     """Replace %DATE%, %TIME%, %CLIP% etc. in expansion text."""
-    for token, fn in DYN_VARS.items():
+    for token in DYN_VARS:
         if token in text:
             if token == "%CLIP%":
                 text = text.replace(token, get_clipboard())
             else:
-                text = text.replace(token, fn())
+                text = text.replace(token, _dyn_cached(token, int(time.time())))
     return text
 
 
@@ -196,16 +678,16 @@ def resolve_variables(text: str) -> str:
 def is_password_field() -> bool:
     """Return True if the currently focused control is a password field."""
     try:
-        hwnd = ctypes.windll.user32.GetForegroundWindow()
-        focused = ctypes.windll.user32.GetFocus()
+        hwnd = _user32.GetForegroundWindow()
+        focused = _user32.GetFocus()
         target = focused if focused else hwnd
         # Check ES_PASSWORD style
-        style = ctypes.windll.user32.GetWindowLongW(target, -16)
+        style = _user32.GetWindowLongW(target, -16)
         if style & ES_PASSWORD:
             return True
         # Check class name
         buf = ctypes.create_unicode_buffer(256)
-        ctypes.windll.user32.GetClassNameW(target, buf, 256)
+        _user32.GetClassNameW(target, buf, 256)
         if buf.value in BLOCKED_WINDOW_CLASSES:
             return True
         return False
@@ -216,18 +698,18 @@ def is_password_field() -> bool:
 def get_foreground_process_name() -> str:
     """Return the executable name of the current foreground window process."""
     try:
-        hwnd = ctypes.windll.user32.GetForegroundWindow()
+        hwnd = _user32.GetForegroundWindow()
         pid = ctypes.wintypes.DWORD()
-        ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
         PROCESS_QUERY_LIMITED = 0x1000
-        handle = ctypes.windll.kernel32.OpenProcess(
+        handle = _kernel32.OpenProcess(
             PROCESS_QUERY_LIMITED, False, pid.value
         )
         if not handle:
             return ""
         buf = ctypes.create_unicode_buffer(260)
-        ctypes.windll.kernel32.GetModuleFileNameExW(handle, None, buf, 260)
-        ctypes.windll.kernel32.CloseHandle(handle)
+        _kernel32.GetModuleFileNameExW(handle, None, buf, 260)
+        _kernel32.CloseHandle(handle)
         return Path(buf.value).name.lower()
     except Exception:
         return ""
@@ -239,6 +721,7 @@ def get_foreground_process_name() -> str:
 class Blocklist:
     def __init__(self):
         self.entries: list[str] = []  # lowercase exe names e.g. "cmd.exe"
+        self._lookup: set[str] = set()  # is_blocked runs per keystroke
         self.load()
 
     def load(self):
@@ -247,6 +730,7 @@ class Blocklist:
                 self.entries = json.loads(BLOCKLIST_FILE.read_text(encoding="utf-8"))
             except Exception:
                 self.entries = []
+        self._lookup = {e.lower() for e in self.entries}
 
     def save(self):
         BLOCKLIST_FILE.write_text(
@@ -254,16 +738,18 @@ class Blocklist:
         )
 
     def is_blocked(self, process_name: str) -> bool:
-        return process_name.lower() in self.entries
+        return process_name in self._lookup
 
     def add(self, name: str):
         n = name.lower().strip()
-        if n and n not in self.entries:
+        if n and n not in self._lookup:
             self.entries.append(n)
+            self._lookup.add(n)
             self.save()
 
     def remove(self, name: str):
         self.entries = [e for e in self.entries if e != name.lower()]
+        self._lookup = {e.lower() for e in self.entries}
         self.save()
 
 
@@ -278,19 +764,62 @@ class SnippetStore:
             if key:
                 self._fernet = Fernet(key)
         self.snippets: list[dict] = []
+        self.version = 0   # bumped on every mutation — lets the engine cache its matcher
+        self._by_id: dict[str, dict] = {}
+        self._file_mtime: float | None = None
         self.load()
+        # Coalescing background writer: GUI actions mark the store dirty and
+        # return immediately; one daemon thread batches bursts of edits into
+        # a single disk write ~0.5 s later. flush() forces a write on quit.
+        self._dirty = threading.Event()
+        self._save_lock = threading.Lock()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
 
     # ── Persistence ─────────────────────────────────────────────
 
+    def _mark_dirty(self):
+        """Queue a write and invalidate the engine's cached matcher — for
+        mutations that can change the trigger set (add/update/delete)."""
+        self.version += 1
+        self._dirty.set()
+
+    def _writer_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(0.5)   # let a burst of edits coalesce
+            self._dirty.clear()
+            self.save()
+
+    def flush(self):
+        """Synchronously write the store (call before exit).
+
+        Saves unconditionally: the writer thread clears the dirty flag
+        before it starts saving, so gating on the flag here would skip the
+        flush — and lose edits — if quit lands mid-save. One extra write at
+        exit is cheap; save() is lock-guarded against the writer.
+        """
+        self._dirty.clear()
+        self.save()
+
     def load(self):
         if not SNIPPETS_FILE.exists():
             self.snippets = []
             return
         try:
-            raw = json.loads(SNIPPETS_FILE.read_text(encoding="utf-8"))
+            mtime = SNIPPETS_FILE.stat().st_mtime
+            if self._file_mtime is not None and mtime == self._file_mtime:
+                return   # file unchanged since our last read/write
+            payload = SNIPPETS_FILE.read_bytes()
+            if ORJSON_AVAILABLE:
+                raw = orjson.loads(payload)
+            else:
+                raw = json.loads(payload.decode("utf-8"))
             for s in raw:
                 s["expansion"] = decrypt_str(s.get("expansion", ""), self._fernet)
             self.snippets = raw
+            self._by_id = {s["id"]: s for s in raw if "id" in s}
+            self.version += 1
+            self._file_mtime = mtime
             log.info(f"Loaded {len(self.snippets)} snippets.")
         except Exception as e:
             log.error(f"Failed to load snippets: {e}")
@@ -298,14 +827,23 @@ class SnippetStore:
 
     def save(self):
         try:
-            data = []
-            for s in self.snippets:
-                row = dict(s)
-                row["expansion"] = encrypt_str(s["expansion"], self._fernet)
-                data.append(row)
-            SNIPPETS_FILE.write_text(
-                json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
-            )
+            with self._save_lock:
+                data = []
+                for s in self.snippets:
+                    row = dict(s)
+                    row["expansion"] = encrypt_str(s["expansion"], self._fernet)
+                    data.append(row)
+                if ORJSON_AVAILABLE:
+                    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+                else:
+                    payload = json.dumps(
+                        data, indent=2, ensure_ascii=False
+                    ).encode("utf-8")
+                # Write-then-rename so a crash mid-write never truncates the file
+                tmp = SNIPPETS_FILE.with_suffix(".json.tmp")
+                tmp.write_bytes(payload)
+                os.replace(tmp, SNIPPETS_FILE)
+                self._file_mtime = SNIPPETS_FILE.stat().st_mtime
         except Exception as e:
             log.error(f"Failed to save snippets: {e}")
 
@@ -338,29 +876,34 @@ class SnippetStore:
             "enabled": True,
         }
         self.snippets.append(s)
-        self.save()
+        self._by_id[s["id"]] = s
+        self._mark_dirty()
         return s
 
+    def get(self, sid: str) -> dict | None:
+        return self._by_id.get(sid)
+
     def update(self, sid: str, trigger: str, expansion: str,
                group: str, enabled: bool):
-        for s in self.snippets:
-            if s["id"] == sid:
-                s.update(trigger=trigger, expansion=expansion,
-                          group=group, enabled=enabled)
-                self.save()
-                return
+        s = self._by_id.get(sid)
+        if s:
+            s.update(trigger=trigger, expansion=expansion,
+                      group=group, enabled=enabled)
+            self._mark_dirty()
 
     def delete(self, sid: str):
         self.snippets = [s for s in self.snippets if s["id"] != sid]
-        self.save()
+        self._by_id.pop(sid, None)
+        self._mark_dirty()
 
     def record_use(self, sid: str):
-        for s in self.snippets:
-            if s["id"] == sid:
-                s["use_count"] = s.get("use_count", 0) + 1
-                s["last_used"] = datetime.utcnow().isoformat()
-                break
-        self.save()
+        s = self._by_id.get(sid)
+        if s:
+            s["use_count"] = s.get("use_count", 0) + 1
+            s["last_used"] = datetime.utcnow().isoformat()
+        # Stats only — queue a write without bumping version, which would
+        # needlessly rebuild the matcher on the next boundary key.
+        self._dirty.set()
 
     def get_enabled(self) -> list[dict]:
         return [s for s in self.snippets if s.get("enabled", True)]
@@ -416,11 +959,30 @@ class KeyboardEngine:
         self.store      = store
         self.blocklist  = blocklist
         self.on_expansion = on_expansion
-        self._buffer: list[str] = []
+        # Bounded deque: append is O(1) with automatic eviction, so the hot
+        # path never reallocates the way the old list-slicing trim did.
+        self._buffer: deque[str] = deque(maxlen=self.MAX_BUFFER)
         self._listener  = None
-        self._controller = pynput_kb.Controller()
+        self._controller = None   # pynput Controller, created on first fallback use
         self._lock      = threading.Lock()
         self._running   = False
+        self._automaton = None
+        self._matcher_version = -1   # forces a build on first boundary key
+        self._fallback_regex = None
+        self._by_trigger: dict[str, dict] = {}
+        self._native_hook = _NativeKeyboardHook(self._on_native_key)
+        self._native = False
+        # Producer/consumer split: hook callbacks only enqueue and return,
+        # so the OS hook chain is never blocked by password-field checks,
+        # process lookups, matching or injection — all of that runs on the
+        # worker thread below.
+        self._ring: deque[tuple] = deque(maxlen=256)
+        self._wake = threading.Semaphore(0)
+        # Filled by _init_pynput_keysets once the fallback listener starts
+        self._pyn_backspace = None
+        self._pyn_boundary: dict = {}
+        self._pyn_clear: frozenset = frozenset()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
 
     # ── Lifecycle ───────────────────────────────────────────────
 
@@ -428,13 +990,48 @@ class KeyboardEngine:
         if self._running:
             return
         self._running = True
+        # Prefer the native WH_KEYBOARD_LL hook — lower latency than pynput
+        # and it lets us skip our own injected SendInput events.
+        self._native = self._native_hook.start()
+        if self._native:
+            log.info("Engine started (native keyboard hook).")
+            return
+        self._init_pynput_keysets()
         self._listener = pynput_kb.Listener(on_press=self._on_press, suppress=False)
         self._listener.daemon = True
         self._listener.start()
-        log.info("Engine started.")
+        log.info("Engine started (pynput listener).")
+
+    def _init_pynput_keysets(self):
+        """Precompute special-key lookups so _on_press does one hash probe
+        per special key instead of a chain of rich-equality comparisons."""
+        if self._pyn_backspace is not None:
+            return
+        kb = _load_pynput()
+        enter = kb.Key.enter
+        self._pyn_backspace = kb.Key.backspace
+        self._pyn_boundary = {
+            kb.Key.space: " ",
+            kb.Key.tab:   "\t",
+            enter:        "\n",
+            getattr(kb.Key, "return_", enter): "\n",
+        }
+        self._pyn_clear = frozenset((
+            kb.Key.esc, kb.Key.delete,
+            kb.Key.left, kb.Key.right, kb.Key.up, kb.Key.down,
+            kb.Key.home, kb.Key.end, kb.Key.page_up, kb.Key.page_down,
+        ))
+
+    def _pynput_controller(self):
+        if self._controller is None:
+            self._controller = _load_pynput().Controller()
+        return self._controller
 
     def stop(self):
         self._running = False
+        if self._native:
+            self._native_hook.stop()
+            self._native = False
         if self._listener:
             self._listener.stop()
             self._listener = None
@@ -448,77 +1045,179 @@ class KeyboardEngine:
 
     # ── Key Handler ─────────────────────────────────────────────
 
-    def _on_press(self, key):
+    def _enqueue(self, event: tuple):
+        """Hot path for both input sources: O(1) append + semaphore release."""
+        self._ring.append(event)
+        self._wake.release()
+
+    def _worker_loop(self):
+        while True:
+            self._wake.acquire()
+            while True:
+                try:
+                    event = self._ring.popleft()
+                except IndexError:
+                    break
+                if not self._should_process():
+                    continue
+                kind = event[0]
+                if kind == "char":
+                    self._handle_char(event[1])
+                elif kind == "boundary":
+                    self._handle_boundary(event[1])
+                elif kind == "backspace":
+                    self._handle_backspace()
+                else:
+                    self._handle_clear()
+
+    def _should_process(self) -> bool:
         if not self._running:
-            return
+            return False
         if is_password_field():
-            return
+            return False
         if self.blocklist.is_blocked(get_foreground_process_name()):
-            return
+            return False
+        return True
 
+    # Input-source-agnostic feeds — run on the worker thread only.
+
+    def _handle_char(self, char: str):
         with self._lock:
-            try:
-                char = key.char
-                if char is None:
-                    return
-                self._buffer.append(char)
-                if len(self._buffer) > self.MAX_BUFFER:
-                    self._buffer = self._buffer[-self.MAX_BUFFER:]
-
-            except AttributeError:
-                # Special key handling
-                if key == pynput_kb.Key.backspace:
-                    if self._buffer:
-                        self._buffer.pop()
-
-                elif key in (pynput_kb.Key.space, pynput_kb.Key.tab,
-                             pynput_kb.Key.enter, pynput_kb.Key.return_):
-                    boundary = {
-                        pynput_kb.Key.space:  " ",
-                        pynput_kb.Key.tab:    "\t",
-                        pynput_kb.Key.enter:  "\n",
-                        pynput_kb.Key.return_: "\n",
-                    }.get(key, " ")
-                    self._buffer.append(boundary)
-                    if len(self._buffer) > self.MAX_BUFFER:
-                        self._buffer = self._buffer[-self.MAX_BUFFER:]
-                    self._check_and_expand()
-
-                elif key in (pynput_kb.Key.esc, pynput_kb.Key.delete):
-                    self._buffer.clear()
-
-                elif key in (pynput_kb.Key.left, pynput_kb.Key.right,
-                             pynput_kb.Key.up, pynput_kb.Key.down,
-                             pynput_kb.Key.home, pynput_kb.Key.end,
-                             pynput_kb.Key.page_up, pynput_kb.Key.page_down):
-                    self._buffer.clear()
+            self._buffer.append(char)
+
+    def _handle_backspace(self):
+        with self._lock:
+            if self._buffer:
+                self._buffer.pop()
+
+    def _handle_boundary(self, boundary: str):
+        with self._lock:
+            self._buffer.append(boundary)
+            self._check_and_expand()
+
+    def _handle_clear(self):
+        with self._lock:
+            self._buffer.clear()
+
+    # Native hook path — raw virtual-key codes
+    _VK_BOUNDARY = {0x20: " ", 0x09: "\t", 0x0D: "\n"}
+    _VK_CLEAR = frozenset((
+        0x1B, 0x2E,              # esc, delete
+        0x21, 0x22, 0x23, 0x24,  # page-up, page-down, end, home
+        0x25, 0x26, 0x27, 0x28,  # arrows
+    ))
+
+    def _on_native_key(self, vk: int, char: str | None):
+        if not self._running:
+            return
+        if vk == VK_BACK:
+            self._enqueue(("backspace",))
+        elif vk in self._VK_BOUNDARY:
+            self._enqueue(("boundary", self._VK_BOUNDARY[vk]))
+        elif vk in self._VK_CLEAR:
+            self._enqueue(("clear",))
+        elif char:
+            for c in char:
+                self._enqueue(("char", c))
+
+    # pynput fallback path
+
+    def _on_press(self, key):
+        if not self._running:
+            return
+        try:
+            char = key.char
+            if char is None:
+                return
+            self._enqueue(("char", char))
+
+        except AttributeError:
+            # Special key handling — precomputed lookups, one probe each
+            if key is self._pyn_backspace:
+                self._enqueue(("backspace",))
+                return
+            boundary = self._pyn_boundary.get(key)
+            if boundary is not None:
+                self._enqueue(("boundary", boundary))
+            elif key in self._pyn_clear:
+                self._enqueue(("clear",))
 
     # ── Matching ────────────────────────────────────────────────
 
+    def _rebuild_matcher(self):
+        """Rebuild the Aho-Corasick automaton over the enabled triggers.
+
+        One automaton pass replaces the per-snippet endswith() scan, so a
+        boundary key costs O(len(buffer)) in C instead of O(snippets × trigger
+        length) in Python — the scan used to run inside the listener callback,
+        where slow handlers make pynput drop or delay key events.
+        """
+        self._matcher_version = self.store.version
+        self._automaton = None
+        enabled = self.store.get_enabled()
+
+        # Zero-dependency fallback: one compiled alternation, sorted longest
+        # first, anchored to the buffer end with the word-boundary class
+        # folded in — the whole match runs in the re engine's C loop. The
+        # leftmost successful position is the longest boundary-valid trigger.
+        by_trigger: dict[str, dict] = {}
+        for snippet in enabled:
+            trigger = snippet["trigger"]
+            if not trigger:
+                continue
+            by_trigger.setdefault(trigger, snippet)
+        self._by_trigger = by_trigger
+        if by_trigger:
+            boundary_cls = "".join(re.escape(c) for c in WORD_BOUNDARY_CHARS)
+            alternation = "|".join(
+                re.escape(t) for t in sorted(by_trigger, key=len, reverse=True)
+            )
+            self._fallback_regex = re.compile(
+                f"(?:^|[{boundary_cls}])({alternation})\\Z"
+            )
+        else:
+            self._fallback_regex = None
+
+        if not AHOCORASICK_AVAILABLE or not enabled:
+            return
+        automaton = ahocorasick.Automaton()
+        for snippet in enabled:
+            trigger = snippet["trigger"]
+            automaton.add_word(trigger, (len(trigger), snippet))
+        automaton.make_automaton()
+        self._automaton = automaton
+
     def _check_and_expand(self):
         buf = "".join(self._buffer)
         # Strip trailing boundary to get typed content
         content = buf.rstrip(" \t\n\r")
 
-        # Longest trigger wins
-        snippets = sorted(
-            self.store.get_enabled(),
-            key=lambda s: len(s["trigger"]),
-            reverse=True,
-        )
+        if self._matcher_version != self.store.version:
+            self._rebuild_matcher()
+
+        if self._automaton is not None:
+            end = len(content) - 1
+            best = None
+            for pos, (tlen, snippet) in self._automaton.iter(content):
+                if pos != end:
+                    continue
+                idx = len(content) - tlen
+                if idx == 0 or content[idx - 1] in WORD_BOUNDARY_CHARS:
+                    # Longest trigger wins
+                    if best is None or tlen > best[0]:
+                        best = (tlen, snippet)
+            if best:
+                self._expand(best[1], best[1]["trigger"])
+            return
 
-        for snippet in snippets:
-            trigger = snippet["trigger"]
-            if not content.endswith(trigger):
-                continue
-            idx = len(content) - len(trigger)
-            boundary_ok = (
-                idx == 0 or content[idx - 1] in WORD_BOUNDARY_CHARS
-            )
-            if not boundary_ok:
-                continue
-            self._expand(snippet, trigger)
+        # Fallback when pyahocorasick is not installed — single compiled
+        # regex search instead of a Python-level scan.
+        if not content or self._fallback_regex is None:
             return
+        m = self._fallback_regex.search(content)
+        if m:
+            trigger = m.group(1)
+            self._expand(self._by_trigger[trigger], trigger)
 
     def _expand(self, snippet: dict, trigger: str):
         expansion = resolve_variables(snippet["expansion"])
@@ -538,11 +1237,19 @@ class KeyboardEngine:
 
         def do_expand():
             time.sleep(0.02)
-            for _ in range(delete_count):
-                self._controller.press(pynput_kb.Key.backspace)
-                self._controller.release(pynput_kb.Key.backspace)
-                time.sleep(0.004)
-            self._controller.type(expansion)
+            if not send_backspaces(delete_count):
+                # Fallback: per-key injection through pynput
+                kb = _load_pynput()
+                controller = self._pynput_controller()
+                for _ in range(delete_count):
+                    controller.press(kb.Key.backspace)
+                    controller.release(kb.Key.backspace)
+                    time.sleep(0.004)
+            if len(expansion) > CLIPBOARD_PASTE_THRESHOLD \
+                    and paste_via_clipboard(expansion):
+                pass
+            elif not send_unicode_text(expansion):
+                self._pynput_controller().type(expansion)
             log.info(f"Expanded '{trigger}' → '{expansion[:60]}'")
 
         threading.Thread(target=do_expand, daemon=True).start()
@@ -560,7 +1267,7 @@ class GlobalHotkey:
         self._listener  = None
 
     def start(self):
-        self._listener = pynput_kb.Listener(
+        self._listener = _load_pynput().Listener(
             on_press=self._on_press, on_release=self._on_release
         )
         self._listener.daemon = True
@@ -668,18 +1375,34 @@ def check_for_update(current_version: str, callback):
 # ──────────────────────────────────────────────────────────────────
 # SYSTEM TRAY
 # ──────────────────────────────────────────────────────────────────
+# Tray icon pre-rendered offline (64×64 rounded square with "ST") and
+# embedded so startup never pays for an ImageDraw render; the paused
+# variant is still drawn on demand since it is rarely needed.
+_TRAY_ICON_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAEAAAABACAYAAACqaXHeAAAAs0lEQVR42u3b2w2AIAwFUOdw"
+    "SOd1G53AII8QaE8Tfkvu+cLYHodSTXVe97PSSRd4GshuwYdC7B6+CyFK+CaEaOGrEKKG/42Q"
+    "GiB6+CICAACJAbKE/0QAAABAVYPeGt2v1B8AAAB9ALUXjD6j7wcAAAAAAAAAzHsIAQAAIBbA"
+    "7AAAAAAAAAAAgHU+htI9hAAASA7g5ygAAOaETIkBAGBe2LS4nQFbI/aGbI7ZH0wU3Oqsil0v"
+    "b/VEx2GgKskAAAAASUVORK5CYII="
+)
+
+
 def _try_start_tray(app_ref):
     try:
+        import io
+
         import pystray
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import Image, ImageDraw
 
         def _make_icon(paused: bool = False):
+            if not paused:
+                return Image.open(io.BytesIO(_TRAY_ICON_PNG))
             size = 64
-            bg   = (60, 60, 60) if paused else (26, 110, 216)
             img  = Image.new("RGBA", (size, size), (0, 0, 0, 0))
             d    = ImageDraw.Draw(img)
-            d.rounded_rectangle([2, 2, size - 2, size - 2], radius=12, fill=bg)
-            d.text((14, 18), "ST" if not paused else "⏸", fill=(255, 255, 255))
+            d.rounded_rectangle([2, 2, size - 2, size - 2], radius=12,
+                                fill=(60, 60, 60))
+            d.text((14, 18), "⏸", fill=(255, 255, 255))
             return img
 
         def show(_i, _it):
@@ -704,7 +1427,11 @@ def _try_start_tray(app_ref):
         )
 
         icon = pystray.Icon(APP_NAME, _make_icon(), APP_NAME, menu)
-        threading.Thread(target=icon.run, daemon=True).start()
+        try:
+            icon.run_detached()   # non-blocking; pystray manages its own loop
+        except (AttributeError, NotImplementedError):
+            # Older pystray without run_detached support
+            threading.Thread(target=icon.run, daemon=True).start()
         log.info("System tray icon active.")
         return icon
     except ImportError:
@@ -810,13 +1537,14 @@ class SnippetDialog(tk.Toplevel):
             return
 
         if self.snippet is None:
-            self.app.store.add(trigger, expansion, group)
+            changed = self.app.store.add(trigger, expansion, group)
         else:
             self.app.store.update(
                 self.snippet["id"], trigger, expansion, group, enabled
             )
+            changed = self.snippet   # updated in place by the store
 
-        self.app._refresh_tree()
+        self.app._on_snippet_changed(changed)
         self.destroy()
 
 
@@ -902,6 +1630,7 @@ class App:
         )
         self._tray     = None
         self._session_expansions = 0
+        self._row_cache: dict[str, tuple] = {}  # sid → displayed row values
 
         self.root = tk.Tk()
         self.root.title(f"Smart Text Replacer  v{APP_VERSION}")
@@ -1112,36 +1841,79 @@ class App:
 
     # ── Tree ────────────────────────────────────────────────────
 
-    def _refresh_tree(self):
+    def _row_values(self, s: dict) -> tuple:
+        values = self._row_cache.get(s["id"])
+        if values is None:
+            exp = s["expansion"]
+            display = exp[:80] + ("…" if len(exp) > 80 else "")
+            values = (
+                s["trigger"],
+                display.translate(DISPLAY_ESCAPES),
+                s.get("group", "General"),
+                s.get("use_count", 0),
+                "✓" if s.get("enabled", True) else "✗",
+            )
+            self._row_cache[s["id"]] = values
+        return values
+
+    def _matches_filter(self, s: dict) -> bool:
+        gf = self._grp_var.get()
+        if gf != "All" and s.get("group", "General") != gf:
+            return False
+        search = self._search_var.get().lower()
+        if search and search not in s["trigger"].lower() \
+                  and search not in s["expansion"].lower():
+            return False
+        return True
+
+    def _refresh_group_combo(self) -> bool:
+        """Sync the group filter combobox. True if the filter had to reset."""
         groups = ["All"] + self.store.groups()
         self._grp_combo["values"] = groups
         if self._grp_var.get() not in groups:
             self._grp_var.set("All")
+            return True
+        return False
 
-        search = self._search_var.get().lower()
-        gf     = self._grp_var.get()
-
+    def _refresh_tree(self):
+        """Full rebuild — initial load, imports, and filter/search changes."""
+        self._row_cache.clear()   # use counts may have moved underneath us
+        self._refresh_group_combo()
         self.tree.delete(*self.tree.get_children())
         for s in self.store.snippets:
-            if gf != "All" and s.get("group", "General") != gf:
-                continue
-            if search and search not in s["trigger"].lower() \
-                      and search not in s["expansion"].lower():
-                continue
-            self.tree.insert("", tk.END, iid=s["id"], values=(
-                s["trigger"],
-                s["expansion"][:80] + ("…" if len(s["expansion"]) > 80 else ""),
-                s.get("group", "General"),
-                s.get("use_count", 0),
-                "✓" if s.get("enabled", True) else "✗",
-            ))
+            if self._matches_filter(s):
+                self.tree.insert("", tk.END, iid=s["id"],
+                                 values=self._row_values(s))
+
+    def _on_snippet_changed(self, s: dict):
+        """Differential update after add/edit: touch only the changed row."""
+        self._row_cache.pop(s["id"], None)
+        if self._refresh_group_combo():
+            self._refresh_tree()   # group filter vanished — rebuild
+            return
+        iid = s["id"]
+        if self._matches_filter(s):
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self._row_values(s))
+            else:
+                self.tree.insert("", tk.END, iid=iid,
+                                 values=self._row_values(s))
+        elif self.tree.exists(iid):
+            self.tree.delete(iid)
+
+    def _on_snippet_deleted(self, sid: str):
+        self._row_cache.pop(sid, None)
+        if self._refresh_group_combo():
+            self._refresh_tree()
+            return
+        if self.tree.exists(sid):
+            self.tree.delete(sid)
 
     def _selected_snippet(self) -> dict | None:
         sel = self.tree.selection()
         if not sel:
             return None
-        sid = sel[0]
-        return next((s for s in self.store.snippets if s["id"] == sid), None)
+        return self.store.get(sel[0])
 
     # ── Snippet Actions ──────────────────────────────────────────
 
@@ -1161,14 +1933,16 @@ class App:
             return
         if messagebox.askyesno("Delete", f"Delete snippet '{s['trigger']}'?"):
             self.store.delete(s["id"])
-            self._refresh_tree()
+            self._on_snippet_deleted(s["id"])
 
     def _duplicate_snippet(self):
         s = self._selected_snippet()
         if not s:
             return
-        self.store.add(s["trigger"] + "2", s["expansion"], s.get("group", "General"))
-        self._refresh_tree()
+        dup = self.store.add(
+            s["trigger"] + "2", s["expansion"], s.get("group", "General")
+        )
+        self._on_snippet_changed(dup)
 
     # ── Import / Export ──────────────────────────────────────────
 
@@ -1307,6 +2081,7 @@ class App:
     def quit(self):
         self.engine.stop()
         self._hotkey.stop()
+        self.store.flush()   # don't lose edits pending in the debounced writer
         self.root.destroy()
 
     def run(self):